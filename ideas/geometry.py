@@ -1,9 +1,13 @@
-from dataclasses import replace
+from dataclasses import astuple, replace
 from schema import schema
 from numpy import array, linspace, meshgrid, sqrt, sin, cos, pi
 from numpy.typing import NDArray
 
 
+CELL_CENTERS_CACHE = dict()
+CELL_CENTERS_CACHE_SIZE = 64
+
+
 def partition(elements: int, num_parts: int):
     """
     Equitably divide the given number of elements into `num_parts` partitions.
@@ -87,25 +91,60 @@ class CoordinateBox:
         xv = self._vertices(axis)
         return 0.5 * (xv[1:] + xv[:-1])
 
-    def cell_centers(self, dim: int = None) -> NDArray[float]:
+    def cell_centers(self, dim: int = None, sparse=False) -> NDArray[float]:
         """
         Return an array or tuple of arrays of the cell-center coordinates
+
+        If `sparse` is `True` then, for dimensions greater than 1, each of
+        the returned arrays has extent 1 on all but its own axis, and the
+        arrays broadcast against one another to the full grid shape.
+
+        The 1d and sparse results, which are small compared to the grid, are
+        cached on the box fields and the arguments; up to
+        `CELL_CENTERS_CACHE_SIZE` of them are kept, the oldest being evicted
+        first. Cached arrays are read-only (sparse results are a tuple), and
+        callers must copy them before making modifications. Dense results
+        for dimensions greater than 1 are not cached, and are returned as
+        from `numpy.meshgrid`.
         """
         dim = dim or self.dimensionality
 
+        if dim > 1 and not sparse:
+            return self._cell_centers(dim, sparse)
+
+        key = (astuple(self), dim, sparse)
+
+        try:
+            return CELL_CENTERS_CACHE[key]
+        except KeyError:
+            centers = self._cell_centers(dim, sparse)
+
+        if dim == 1:
+            centers.setflags(write=False)
+        else:
+            centers = tuple(centers)
+            for c in centers:
+                c.setflags(write=False)
+
+        if len(CELL_CENTERS_CACHE) >= CELL_CENTERS_CACHE_SIZE:
+            del CELL_CENTERS_CACHE[next(iter(CELL_CENTERS_CACHE))]
+
+        return CELL_CENTERS_CACHE.setdefault(key, centers)
+
+    def _cell_centers(self, dim: int, sparse: bool) -> NDArray[float]:
         if dim == 1:
             return self._centers(axis=0)
 
         if dim == 2:
             xc = self._centers(axis=0)
             yc = self._centers(axis=1)
-            return meshgrid(xc, yc, indexing="ij")
+            return meshgrid(xc, yc, indexing="ij", sparse=sparse)
 
         if dim == 3:
             xc = self._centers(axis=0)
             yc = self._centers(axis=1)
             zc = self._centers(axis=2)
-            return meshgrid(xc, yc, zc, indexing="ij")
+            return meshgrid(xc, yc, zc, indexing="ij", sparse=sparse)
 
     def cell_vertices(self, dim: int = None, drop_final=False) -> NDArray[float]:
         """
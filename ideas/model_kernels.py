@@ -0,0 +1,58 @@
+"""
+Numba-compiled kernels to generate initial data for some of the models
+
+Each kernel fuses the coordinate arithmetic, comparisons, and stores into a
+single loop over the zones, which writes into a caller-allocated output
+array. Output arrays are fields-first, so each field is written with unit
+stride.
+
+This module requires numba (pip3 install --user numba), which is an optional
+dependency. The models module only imports it for grids of at least
+`models.MODELS_KERNELS_MIN_ZONES` zones, and falls back to numpy expressions
+if numba is not installed or the kernels are disabled with
+`models.configure_models_module(disable_kernels=True)`.
+"""
+
+
+from math import sin, pi
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def density_wave(x, amplitude, out):
+    """
+    Write a sinusoidal density profile with uniform velocity and pressure
+    """
+    for i in prange(x.size):
+        out[0, i] = 1.0 + amplitude * sin(2.0 * pi * x[i])
+        out[1, i] = 1.0
+        out[2, i] = 1.0
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def shu_osher_wave(x, out):
+    """
+    Write the sinusoidal density profile ahead of the Shu-Osher shock
+    """
+    for i in prange(x.size):
+        out[0, i] = 1.0 + 0.2 * sin(5.0 * x[i])
+        out[1, i] = 0.0
+        out[2, i] = 1.0
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def two_state_disk(x, y, radius_squared, state_a, state_b, out):
+    """
+    Write state a inside a disk centered at the origin and state b outside
+
+    The x and y arguments are the 1d arrays of cell-center coordinates on
+    each axis, and the output array has shape (num_fields, x.size, y.size).
+    """
+    for i in prange(x.size):
+        for j in range(y.size):
+            if x[i] * x[i] + y[j] * y[j] < radius_squared:
+                s = state_a
+            else:
+                s = state_b
+            for q in range(s.size):
+                out[q, i, j] = s[q]
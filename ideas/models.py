@@ -11,45 +11,266 @@ discriminating field.
 """
 
 
+from contextlib import contextmanager
+from dataclasses import astuple
+from functools import wraps
 from typing import Literal, Union
-from numpy import logical_not, zeros, sqrt, sin, cos, pi
+from numpy import (
+    array,
+    asarray,
+    empty,
+    float64,
+    moveaxis,
+    multiply,
+    searchsorted,
+    where,
+    sqrt,
+    sin,
+    cos,
+    pi,
+)
 from preset import preset
 from schema import schema
 from geometry import CoordinateBox
 
 
-def two_state(region_a, state_a, state_b):
-    region_b = logical_not(region_a)
-    p = zeros(region_a.shape + (len(state_a),))
-    p[region_a] = state_a
-    p[region_b] = state_b
-    return p
+PRIMITIVE_CACHE = None
+DISK_TILE_SIZE = 64
+MODELS_DISABLE_KERNELS = False
+MODELS_KERNELS_MIN_ZONES = 1 << 22
 
 
-@schema
-class Sod:
+def configure_models_module(disable_kernels=None, kernels_min_zones=None):
     """
-    Classic Sod shocktube initial data
+    Configure the module behavior.
+
+    Numba-compiled kernels (see `model_kernels`) are used to generate the
+    initial data of some models on grids of at least `kernels_min_zones`
+    zones. Below that size, the JIT compile time exceeds the time saved, so
+    the numpy expressions are used. The kernels can be disabled altogether.
+    Calls to this function affect shared module state, so should be called
+    from conspicuous / obvious locations of the user application.
     """
+    global MODELS_DISABLE_KERNELS
+    global MODELS_KERNELS_MIN_ZONES
 
-    model: Literal["sod"] = "sod"
+    if disable_kernels:
+        MODELS_DISABLE_KERNELS = True
+    if kernels_min_zones is not None:
+        MODELS_KERNELS_MIN_ZONES = kernels_min_zones
+
+
+def get_model_kernels(num_zones: int):
+    """
+    Return the compiled model kernels module, or None to use numpy
+
+    The module is only imported (which imports numba) if the kernels are
+    enabled, numba is installed, and the grid has enough zones.
+    """
+    if MODELS_DISABLE_KERNELS or num_zones < MODELS_KERNELS_MIN_ZONES:
+        return None
+
+    try:
+        import model_kernels
+    except ImportError:
+        return None
+
+    return model_kernels
+
+
+@contextmanager
+def primitive_cache():
+    """
+    Context in which model primitive data is memoized on the model and box
+
+    Models and coordinate boxes are immutable, so inside this context the
+    primitive data for a given pair is computed once and reused. The cache
+    holds a copy of the data until the context exits, so it should only be
+    entered where the same data is requested more than once, e.g. by the
+    solver setup of a run with forcing, where the forcing target of each grid
+    patch is its initial data.
+    """
+    global PRIMITIVE_CACHE
+
+    PRIMITIVE_CACHE = dict()
+    try:
+        yield
+    finally:
+        PRIMITIVE_CACHE = None
+
+
+def cached_primitive(primitive):
+    """
+    Decorator to memoize a model's primitive function inside `primitive_cache`
+
+    The data type of the returned array (float64 by default) is part of the
+    cache key. Arrays returned from the cache are read-only; callers which
+    need to modify the data must make a copy. Outside of a `primitive_cache`
+    context the data is computed on each call.
+    """
+
+    @wraps(primitive)
+    def wrapper(self, box: CoordinateBox, dtype=float64):
+        if PRIMITIVE_CACHE is None:
+            return primitive(self, box, dtype)
+
+        key = (type(self), astuple(self), astuple(box), dtype)
+
+        try:
+            return PRIMITIVE_CACHE[key]
+        except KeyError:
+            p = primitive(self, box, dtype)
+            p.setflags(write=False)
+            return PRIMITIVE_CACHE.setdefault(key, p)
+
+    return wrapper
+
+
+def gamma_beta(v):
+    """
+    Return the spatial part of the four-velocity for the given velocity
+    """
+    return v / sqrt(1.0 - v * v)
+
+
+def fields_last(p):
+    """
+    Return a view of a fields-first array, with the fields axis moved last
+
+    Models fill their data in a fields-first (structure-of-arrays) buffer, so
+    each field is written contiguously, and return it through this view to
+    keep the (..., num_fields) shape expected by the solver.
+
+    This only pays off for fields-first runs, where the solver's storage
+    has the same layout. With the default fields-last layout, copying the
+    view into solver storage is a strided read, which costs about what the
+    strided writes it replaces would have.
+    """
+    return moveaxis(p, 0, -1)
+
+
+def column(state, ndim):
+    """
+    Return a state vector reshaped to broadcast against fields-first arrays
+    """
+    return asarray(state, dtype=float).reshape((-1,) + (1,) * ndim)
+
+
+def piecewise_1d(x, x_splits, states, dtype=float64):
+    """
+    Return an array of piecewise constant states on a 1d grid
+
+    The regions are bounded by the sorted sequence `x_splits`, and `states`
+    has one more element than `x_splits`. The 1d cell-center coordinates are
+    sorted, so the region boundaries are found with a single searchsorted,
+    and each region is a contiguous slice which is written once.
+    """
+    i = [0, *searchsorted(x, x_splits), x.size]
+    p = empty((len(states[0]),) + x.shape, dtype=dtype)
+
+    for state, i0, i1 in zip(states, i[:-1], i[1:]):
+        p[:, i0:i1] = column(state, 1)
+
+    return fields_last(p)
+
+
+def frozen_state(values):
+    """
+    Return a read-only float array, for model states defined on the class
+    """
+    state = array(values, dtype=float)
+    state.setflags(write=False)
+    return state
+
+
+def two_state_disk(x, y, radius_squared, state_a, state_b, dtype=float64):
+    """
+    Return an array of state a inside a disk centered at the origin, and b outside
+
+    The x and y arguments are the (possibly sparse) 2d arrays of cell-center
+    coordinates returned by `CoordinateBox.cell_centers`. The compiled kernel
+    is used on large grids if it is available (see `get_model_kernels`).
+    Otherwise the domain is traversed in square tiles of `DISK_TILE_SIZE`
+    zones on a side, so that the radius, the mask, and the output of each
+    tile stay in cache.
+    """
+    state_a = asarray(state_a, dtype=float)
+    state_b = asarray(state_b, dtype=float)
+    xc = x[:, 0]
+    yc = y[0, :]
+    ni = xc.size
+    nj = yc.size
+
+    if (model_kernels := get_model_kernels(ni * nj)) is not None:
+        p = empty(state_a.shape + (ni, nj), dtype=dtype)
+        model_kernels.two_state_disk(xc, yc, radius_squared, state_a, state_b, p)
+        return fields_last(p)
+
+    a = column(state_a, 2)
+    b = column(state_b, 2)
+    nt = DISK_TILE_SIZE
+    p = empty(state_a.shape + (ni, nj), dtype=dtype)
+
+    for i0 in range(0, ni, nt):
+        for j0 in range(0, nj, nt):
+            si = slice(i0, i0 + nt)
+            sj = slice(j0, j0 + nt)
+            xt = xc[si, None]
+            yt = yc[None, sj]
+            r2 = xt * xt + yt * yt
+            p[:, si, sj] = where(r2 < radius_squared, a, b)
+
+    return fields_last(p)
+
+
+class Model:
+    """
+    Base class for model data
+
+    Subclasses define `primitive_fields`, and the number of primitive fields,
+    which sizes the solver arrays and the NPRIM kernel macro, is derived from
+    it so the two cannot disagree.
+    """
+
+    @property
+    def num_primitive_fields(self):
+        return len(self.primitive_fields)
+
+
+class TwoState1d(Model):
+    """
+    Base class for 1d models with a left and right state
+
+    Subclasses define the split point `x_split` and the states `state_l` and
+    `state_r` as class attributes, and share the fast path for generating the
+    primitive data.
+    """
 
     @property
     def dimensionality(self):
         return 1
 
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
+        x = box.cell_centers()
+        return piecewise_1d(x, (self.x_split,), (self.state_l, self.state_r), dtype)
+
+
+@schema
+class Sod(TwoState1d):
+    """
+    Classic Sod shocktube initial data
+    """
+
+    model: Literal["sod"] = "sod"
+    x_split = 0.5
+    state_l = frozen_state([1.0, 0.0, 1.000])
+    state_r = frozen_state([0.1, 0.0, 0.125])
+
     @property
     def primitive_fields(self):
         return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        x = box.cell_centers()
-        return two_state(
-            x < 0.5,
-            [1.0, 0.0, 1.000],
-            [0.1, 0.0, 0.125],
-        )
-
 
 @preset
 def sod():
@@ -61,7 +282,7 @@ def sod():
 
 
 @schema
-class Uniform:
+class Uniform(Model):
     """
     Uniform initial data
 
@@ -70,8 +291,12 @@ class Uniform:
     """
 
     model: Literal["uniform"] = "uniform"
-    dimensionality: int = 1
+    dimensionality: Literal[1, 2] = 1
     coordinates: str = "cartesian"
+    states = (
+        frozen_state([1.0, 0.0, 1.0]),
+        frozen_state([1.0, 0.0, 0.0, 1.0]),
+    )
 
     @property
     def primitive_fields(self):
@@ -80,16 +305,13 @@ class Uniform:
         if self.dimensionality == 2:
             return "density", "i-velocity", "j-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        if self.dimensionality == 1:
-            r = box.cell_centers()
-            p = zeros(r.shape + (3,))
-            p[...] = [1.0, 0.0, 1.0]
-        if self.dimensionality == 2:
-            r, q = box.cell_centers()
-            p = zeros(r.shape + (4,))
-            p[...] = [1.0, 0.0, 0.0, 1.0]
-        return p
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
+        state = self.states[self.dimensionality - 1]
+        shape = box.num_zones[: self.dimensionality]
+        p = empty(state.shape + shape, dtype=dtype)
+        p[...] = column(state, len(shape))
+        return fields_last(p)
 
 
 @preset
@@ -129,8 +351,28 @@ def uniform2d():
     }
 
 
+class TwoStateDisk(Model):
+    """
+    Base class for 2d models with one state inside a disk and another outside
+
+    Subclasses define the disk radius squared `radius_squared` and the states
+    `state_in` and `state_out` as class attributes.
+    """
+
+    @property
+    def dimensionality(self):
+        return 2
+
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
+        x, y = box.cell_centers(sparse=True)
+        return two_state_disk(
+            x, y, self.radius_squared, self.state_in, self.state_out, dtype
+        )
+
+
 @schema
-class CylindricalExplosion:
+class CylindricalExplosion(TwoStateDisk):
     """
     Cylindrical explosion initial data
 
@@ -139,23 +381,14 @@ class CylindricalExplosion:
     """
 
     model: Literal["cylindrical-explosion"] = "cylindrical-explosion"
-
-    @property
-    def dimensionality(self):
-        return 2
+    radius_squared = 0.01
+    state_in = frozen_state([1.0, 0.0, 0.0, 1.000])
+    state_out = frozen_state([0.1, 0.0, 0.0, 0.125])
 
     @property
     def primitive_fields(self):
         return "density", "x-velocity", "y-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        x, y = box.cell_centers()
-        return two_state(
-            sqrt(x**2 + y**2) < 0.1,
-            [1.0, 0.0, 0.0, 1.000],
-            [0.1, 0.0, 0.0, 0.125],
-        )
-
 
 @preset
 def cylindrical_explosion():
@@ -169,7 +402,7 @@ def cylindrical_explosion():
 
 
 @schema
-class CylinderInWind:
+class CylinderInWind(TwoStateDisk):
     """
     A round cylinder immersed in a dilute wind
 
@@ -179,23 +412,14 @@ class CylinderInWind:
     """
 
     model: Literal["cylinder-in-wind"] = "cylinder-in-wind"
-
-    @property
-    def dimensionality(self):
-        return 2
+    radius_squared = 0.01
+    state_in = frozen_state([1e2, 0.0, 0.0, 1.0])
+    state_out = frozen_state([1.0, 1.0, 0.0, 0.1])
 
     @property
     def primitive_fields(self):
         return "density", "x-velocity", "y-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        x, y = box.cell_centers()
-        return two_state(
-            sqrt(x**2 + y**2) < 0.1,
-            [1e2, 0.0, 0.0, 1.0],
-            [1.0, 1.0, 0.0, 0.1],
-        )
-
 
 @preset
 def cylinder_in_wind():
@@ -210,7 +434,7 @@ def cylinder_in_wind():
 
 
 @schema
-class Ram41:
+class Ram41(TwoState1d):
     """
     1d Riemann problem (RAM problem 1; Sec 4.1)
 
@@ -220,18 +444,14 @@ class Ram41:
     """
 
     model: Literal["ram-41"] = "ram-41"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.5
+    state_l = frozen_state([10.0, 0.0, 13.33])
+    state_r = frozen_state([1.0, 0.0, 1e-8])
 
     @property
     def primitive_fields(self):
         return "proper-density", "x-gamma-beta", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        return two_state(box.cell_centers() < 0.5, [10.0, 0.0, 13.33], [1.0, 0.0, 1e-8])
-
 
 @preset
 def ram_41():
@@ -246,7 +466,7 @@ def ram_41():
 
 
 @schema
-class Ram42:
+class Ram42(TwoState1d):
     """
     1d Riemann problem (RAM problem 2; Sec 4.2)
 
@@ -256,18 +476,14 @@ class Ram42:
     """
 
     model: Literal["ram-42"] = "ram-42"
+    x_split = 0.5
+    state_l = frozen_state([1.0, 0.0, 1000.0])
+    state_r = frozen_state([1.0, 0.0, 1e-2])
 
     @property
     def primitive_fields(self):
         return "proper-density", "x-gamma-beta", "pressure"
 
-    @property
-    def dimensionality(self):
-        return 1
-
-    def primitive(self, box: CoordinateBox):
-        return two_state(box.cell_centers() < 0.5, [1.0, 0.0, 1000.0], [1.0, 0.0, 1e-2])
-
 
 @preset
 def ram_42():
@@ -282,7 +498,7 @@ def ram_42():
 
 
 @schema
-class Ram43:
+class Ram43(TwoState1d):
     """
     1d Riemann problem (RAM problem 3; Sec 4.3)
 
@@ -292,21 +508,14 @@ class Ram43:
     """
 
     model: Literal["ram-43"] = "ram-43"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.5
+    state_l = frozen_state([1.0, gamma_beta(0.9), 1.0])
+    state_r = frozen_state([1.0, 0.0, 10.0])
 
     @property
     def primitive_fields(self):
         return "proper-density", "x-gamma-beta", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        v = 0.9
-        u = v / sqrt(1.0 - v * v)
-        x = box.cell_centers()
-        return two_state(x < 0.5, [1.0, u, 1.0], [1.0, 0.0, 10.0])
-
 
 @preset
 def ram_43():
@@ -321,7 +530,7 @@ def ram_43():
 
 
 @schema
-class Ram44:
+class Ram44(TwoState1d):
     """
     1d Riemann problem (RAM problem 4; Sec 4.4)
 
@@ -333,21 +542,14 @@ class Ram44:
     """
 
     model: Literal["ram-44"] = "ram-44"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.5
+    state_l = frozen_state([1.0, 0.0, 0.0, 1e3])
+    state_r = frozen_state([1.0, 0.0, gamma_beta(0.99), 1e-2])
 
     @property
     def primitive_fields(self):
         return "proper-density", "x-gamma-beta", "y-gamma-beta", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        v = 0.99
-        u = v / sqrt(1.0 - v * v)
-        x = box.cell_centers()
-        return two_state(x < 0.5, [1.0, 0.0, 0.0, 1e3], [1.0, 0.0, u, 1e-2])
-
 
 @preset
 def ram_44():
@@ -362,7 +564,7 @@ def ram_44():
 
 
 @schema
-class Ram45:
+class Ram45(Model):
     """
     1d shock heating Riemann problem (RAM problem 5; Sec 4.5)
 
@@ -374,6 +576,7 @@ class Ram45:
     """
 
     model: Literal["ram-45"] = "ram-45"
+    state = frozen_state([1.0, gamma_beta(1.0 - 1e-10), 1e-3])
 
     @property
     def dimensionality(self):
@@ -383,12 +586,12 @@ class Ram45:
     def primitive_fields(self):
         return "proper-density", "x-gamma-beta", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        v = 1.0 - 1e-10
-        u = v / sqrt(1.0 - v * v)
-        pre_small = 1e-3
-        p[...] = [1.0, u, pre_small]
-        return p
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
+        shape = box.num_zones[:1]
+        p = empty(self.state.shape + shape, dtype=dtype)
+        p[...] = column(self.state, 1)
+        return fields_last(p)
 
 
 @preset
@@ -406,7 +609,7 @@ def ram_45():
 
 
 @schema
-class Ram61:
+class Ram61(TwoState1d):
     """
     1d Riemann problem with transverse velocity: (RAM Hard Test; sec 6.1)
 
@@ -418,21 +621,14 @@ class Ram61:
     """
 
     model: Literal["ram-61"] = "ram-61"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.5
+    state_l = frozen_state([1.0, 0.0, gamma_beta(0.9), 1e3])
+    state_r = frozen_state([1.0, 0.0, gamma_beta(0.9), 1e-2])
 
     @property
     def primitive_fields(self):
         return "proper-density", "x-gamma-beta", "y-gamma-beta", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        v = 0.9
-        u = v / sqrt(1.0 - v * v)
-        x = box.cell_centers()
-        return two_state(x < 0.5, [1.0, 0.0, u, 1e3], [1.0, 0.0, u, 1e-2])
-
 
 @preset
 def ram_61():
@@ -447,7 +643,7 @@ def ram_61():
 
 
 @schema
-class FuShu33:
+class FuShu33(TwoState1d):
     """
     Lax problem initial data
 
@@ -457,22 +653,14 @@ class FuShu33:
     """
 
     model: Literal["fu-shu-33"] = "fu-shu-33"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.0
+    state_l = frozen_state([0.445, 0.698, 3.528])
+    state_r = frozen_state([0.500, 0.000, 0.571])
 
     @property
     def primitive_fields(self):
         return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        return two_state(
-            box.cell_centers() < 0.0,
-            [0.445, 0.698, 3.528],
-            [0.500, 0.000, 0.571],
-        )
-
 
 @preset
 def fu_shu_33():
@@ -485,7 +673,7 @@ def fu_shu_33():
 
 
 @schema
-class FuShu34:
+class FuShu34(TwoState1d):
     """
     Lax problem: double rarefaction wave
 
@@ -495,22 +683,14 @@ class FuShu34:
     """
 
     model: Literal["fu-shu-34"] = "fu-shu-34"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.0
+    state_l = frozen_state([7.0, -1.0, 0.2])
+    state_r = frozen_state([7.0, +1.0, 0.2])
 
     @property
     def primitive_fields(self):
         return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        return two_state(
-            box.cell_centers() < 0.0,
-            [7.0, -1.0, 0.2],
-            [7.0, +1.0, 0.2],
-        )
-
 
 @preset
 def fu_shu_34():
@@ -523,7 +703,7 @@ def fu_shu_34():
 
 
 @schema
-class FuShu35:
+class FuShu35(TwoState1d):
     """
     LeBlanc problem
 
@@ -535,22 +715,14 @@ class FuShu35:
     """
 
     model: Literal["fu-shu-35"] = "fu-shu-35"
-
-    @property
-    def dimensionality(self):
-        return 1
+    x_split = 0.0
+    state_l = frozen_state([1.00, 0.0, 2.0 / 3.0 * 1e-1])
+    state_r = frozen_state([1e-3, 0.0, 2.0 / 3.0 * 1e-10])
 
     @property
     def primitive_fields(self):
         return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
-        return two_state(
-            box.cell_centers() < 0.0,
-            [1.00, 0.0, 2.0 / 3.0 * 1e-1],
-            [1e-3, 0.0, 2.0 / 3.0 * 1e-10],
-        )
-
 
 @preset
 def fu_shu_35():
@@ -563,16 +735,21 @@ def fu_shu_35():
 
 
 @schema
-class FuShu36:
+class FuShu36(Model):
     """
     Shu-Osher problem
 
     Adapted from Example 3.6 from G. Fu and C.-W. Shu, "A new trouble-cell
     indicator for discontinuous Galerkin methods for hyperbolic conservation
     laws," Journal of Computational Physics, v347 (2017), pp.305-327.
+
+    The sine region ahead of the shock is generated by a compiled kernel if
+    it spans enough zones (see `get_model_kernels`), and by numpy otherwise.
     """
 
     model: Literal["fu-shu-36"] = "fu-shu-36"
+    x_split = -4.0
+    state_l = frozen_state([3.857143, 2.629369, 10.333333])
 
     @property
     def dimensionality(self):
@@ -582,16 +759,24 @@ class FuShu36:
     def primitive_fields(self):
         return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
         x = box.cell_centers()
-        p = zeros(x.shape + (3,))
-        l = (x >= -5.0) * (x < -4.0)
-        r = (x >= -4.0) * (x < +5.0)
-        p[l] = [3.857143, 2.629369, 10.333333]
-        p[r, 0] = 1.0 + 0.2 * sin(5.0 * x[r])
-        p[r, 1] = 0.0
-        p[r, 2] = 1.0
-        return p
+        i = searchsorted(x, self.x_split)
+        p = empty((3,) + x.shape, dtype=dtype)
+        p[:, :i] = column(self.state_l, 1)
+
+        if (model_kernels := get_model_kernels(x.size - i)) is not None:
+            model_kernels.shu_osher_wave(x[i:], p[:, i:])
+        else:
+            d = p[0, i:]
+            multiply(x[i:], 5.0, out=d)
+            sin(d, out=d)
+            d *= 0.2
+            d += 1.0
+            p[1, i:] = 0.0
+            p[2, i:] = 1.0
+        return fields_last(p)
 
 
 @preset
@@ -605,7 +790,7 @@ def fu_shu_36():
 
 
 @schema
-class FuShu37:
+class FuShu37(Model):
     """
     Blast wave interaction
 
@@ -619,6 +804,14 @@ class FuShu37:
     """
 
     model: Literal["fu-shu-37"] = "fu-shu-37"
+    x_splits = (0.1, 0.9)
+    states = frozen_state(
+        [
+            [1.0, 0.0, 1000.0],
+            [1.0, 0.0, 0.01],
+            [1.0, 0.0, 100.0],
+        ]
+    )
 
     @property
     def dimensionality(self):
@@ -626,18 +819,12 @@ class FuShu37:
 
     @property
     def primitive_fields(self):
-        "density", "x-velocity", "pressure"
+        return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
         x = box.cell_centers()
-        l = (x >= 0.0) * (x < 0.1)
-        m = (x >= 0.1) * (x < 0.9)
-        r = (x >= 0.9) * (x < 1.0)
-        p = zeros(x.shape + (3,))
-        p[l] = [1.0, 0.0, 1000.0]
-        p[m] = [1.0, 0.0, 0.01]
-        p[r] = [1.0, 0.0, 100.0]
-        return p
+        return piecewise_1d(x, self.x_splits, self.states, dtype)
 
 
 @preset
@@ -651,7 +838,7 @@ def fu_shu_37():
 
 
 @schema
-class DensityWave:
+class DensityWave(Model):
     """
     Sinusoidal density wave translating rigidly
     """
@@ -667,13 +854,22 @@ class DensityWave:
     def primitive_fields(self):
         return "density", "x-velocity", "pressure"
 
-    def primitive(self, box: CoordinateBox):
+    @cached_primitive
+    def primitive(self, box: CoordinateBox, dtype=float64):
         x = box.cell_centers()
-        p = zeros(x.shape + (3,))
-        p[..., 0] = 1.0 + self.amplitude * sin(2 * pi * x)
-        p[..., 1] = 1.0
-        p[..., 2] = 1.0
-        return p
+        p = empty((3,) + x.shape, dtype=dtype)
+
+        if (model_kernels := get_model_kernels(x.size)) is not None:
+            model_kernels.density_wave(x, self.amplitude, p)
+        else:
+            d = p[0]
+            multiply(x, 2.0 * pi, out=d)
+            sin(d, out=d)
+            d *= self.amplitude
+            d += 1.0
+            p[1] = 1.0
+            p[2] = 1.0
+        return fields_last(p)
 
 
 @preset
@@ -1,5 +1,7 @@
 from inspect import getargspec
+from logging import getLogger
 
+logger = getLogger("sailfish")
 
 PRESET_FUNCTIONS = dict()
 
@@ -14,7 +16,8 @@ def preset(func):
 
     A preset function returns a preset. Note that preset functions cannot take
     any arguments; if the preset function is defined as part of a class, it
-    cannot take a self parameter.
+    cannot take a self parameter. Preset names must be unique; if a name is
+    registered twice, the first function is kept and a warning is logged.
 
     NOTE: in sailfish versions before 0.6, a preset was also called a "setup."
     This terminology should be avoided, since files and functions with names
@@ -24,8 +27,14 @@ def preset(func):
     if getargspec(func).args:
         raise ValueError("preset function cannot take any arguments")
 
+    name = func.__name__.replace("_", "-")
     func.__preset_function__ = True
-    PRESET_FUNCTIONS[func.__name__.replace("_", "-")] = func
+
+    if name in PRESET_FUNCTIONS:
+        logger.warning(f"preset {name} is already registered; keeping the first")
+    else:
+        PRESET_FUNCTIONS[name] = func
+
     return func
 
 
@@ -2,7 +2,7 @@
 Multi-dimensional 2nd order Godunov solver using the method of lines
 """
 
-from contextlib import nullcontext
+from contextlib import nullcontext, ExitStack
 from logging import getLogger
 from math import prod
 from multiprocessing.pool import ThreadPool
@@ -21,6 +21,7 @@ from geometry import (
     CylindricalPolarCoordinates,
 )
 from index_space import IndexSpace
+from models import primitive_cache
 
 
 @device
@@ -53,7 +54,7 @@ class GradientEstimation:
 
     def __init__(self, config: Sailfish):
         self._dim = config.domain.dimensionality
-        self._nfields = len(config.initial_data.primitive_fields)
+        self._nfields = config.initial_data.num_primitive_fields
         self._transpose = config.strategy.transpose
         self._plm_theta = (
             config.scheme.reconstruction[1]
@@ -201,7 +202,7 @@ class Fields:
         if config.physics.metric == "minkowski":
             self.hydro_lib = __import__("lib_srhd")
         self.dim = config.domain.dimensionality
-        self.nprim = len(config.initial_data.primitive_fields)
+        self.nprim = config.initial_data.num_primitive_fields
         self.transpose = config.strategy.transpose
         self.gamma_law_index = config.physics.equation_of_state.gamma_law_index
 
@@ -349,7 +350,7 @@ class SourceTerms:
 
     def __init__(self, config: Sailfish):
         self._dim = config.domain.dimensionality
-        self._nprim = len(config.initial_data.primitive_fields)
+        self._nprim = config.initial_data.num_primitive_fields
         self._transpose = config.strategy.transpose
         self._cache_prim = config.strategy.cache_prim
 
@@ -631,7 +632,7 @@ class Scheme:
         device_funcs = list()
         define_macros = dict()
         define_macros["DIM"] = config.domain.dimensionality
-        define_macros["NPRIM"] = len(config.initial_data.primitive_fields)
+        define_macros["NPRIM"] = config.initial_data.num_primitive_fields
         define_macros["TRANSPOSE"] = int(config.strategy.transpose)
         define_macros[
             "GAMMA_LAW_INDEX"
@@ -1982,43 +1983,56 @@ def make_solver(config: Sailfish, checkpoint: dict = None):
     num_threads = strategy.num_threads
     gpu_streams = strategy.gpu_streams
     initial_prim = config.initial_data.primitive
-    nprim = len(config.initial_data.primitive_fields)
+    nprim = config.initial_data.num_primitive_fields
 
     streams = list()
     solvers = list()
 
-    for (i0, i1), box in config.domain.decompose(num_patches):
-        space = IndexSpace(box.num_zones, guard=2, layout=strategy.data_layout)
-        extended_box = box.extend(2)
-        p = space.create(zeros, fields=nprim, data=initial_prim(extended_box))
+    # =========================================================================
+    # With forcing, each patch evaluates its initial data twice: once for the
+    # solution arrays and once for the forcing target, in its first step. The
+    # initial data is then cached until every patch has finished its setup,
+    # i.e. yielded its first state. Without forcing, nothing is cached.
+    # =========================================================================
+    setup = ExitStack()
 
-        if checkpoint:
-            t = checkpoint["time"]
-            n = checkpoint["iteration"]
-            p[space.interior] = checkpoint["primitive"][i0:i1]
-        else:
-            t = 0.0
-            n = 0
+    if config.forcing is not None:
+        setup.enter_context(primitive_cache())
 
-        stream = make_stream(hardware, gpu_streams)
-        solver = patch_solver(p, t, n, extended_box, space, kernels, config)
-        streams.append(stream)
-        solvers.append(solver)
+    with setup:
+        for (i0, i1), box in config.domain.decompose(num_patches):
+            space = IndexSpace(box.num_zones, guard=2, layout=strategy.data_layout)
+            extended_box = box.extend(2)
+            p = space.create(zeros, fields=nprim, data=initial_prim(extended_box))
 
-    timestep = None
+            if checkpoint:
+                t = checkpoint["time"]
+                n = checkpoint["iteration"]
+                p[space.interior] = checkpoint["primitive"][i0:i1]
+            else:
+                t = 0.0
+                n = 0
+
+            stream = make_stream(hardware, gpu_streams)
+            solver = patch_solver(p, t, n, extended_box, space, kernels, config)
+            streams.append(stream)
+            solvers.append(solver)
+
+        timestep = None
 
-    def next_with(arg):
-        context, gen = arg
+        def next_with(arg):
+            context, gen = arg
 
-        with context:
-            return gen.send(timestep)
+            with context:
+                return gen.send(timestep)
 
-    with make_worker_pool(num_threads) as pool:
-        while True:
-            events = list(pool.map(next_with, zip(streams, solvers)))
+        with make_worker_pool(num_threads) as pool:
+            while True:
+                events = list(pool.map(next_with, zip(streams, solvers)))
 
-            if type(events[0]) is PatchState:
-                timestep = yield State(config.domain, events)
+                if type(events[0]) is PatchState:
+                    setup.close()
+                    timestep = yield State(config.domain, events)
 
-            elif type(events[0]) is FillGuardZones:
-                fill_guard_zones([e.array for e in events], boundary)
+                elif type(events[0]) is FillGuardZones:
+                    fill_guard_zones([e.array for e in events], boundary)